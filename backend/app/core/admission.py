@@ -0,0 +1,141 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+from fastapi import HTTPException, Depends
+from app.core.security import get_current_user
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Admission control configuration
+ADMISSION_GLOBAL_LIMIT = int(os.getenv("ADMISSION_GLOBAL_LIMIT", "64"))  # requests in flight
+ADMISSION_USER_LIMIT = int(os.getenv("ADMISSION_USER_LIMIT", "4"))  # requests in flight per user
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "128"))  # waiting requests
+ADMISSION_USER_QUEUE_SIZE = int(os.getenv("ADMISSION_USER_QUEUE_SIZE", "8"))  # waiting requests per user
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))  # seconds
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))  # seconds
+
+class _UserSlots:
+    __slots__ = ("semaphore", "active", "waiting")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+
+class AdmissionController:
+    """Limita requisições simultâneas (global e por usuário) com fila limitada.
+
+    Requisições que não conseguem vaga esperam até ``queue_timeout``; se a
+    fila estiver cheia ou o prazo expirar, recebem 503 com Retry-After.
+    """
+
+    def __init__(self, global_limit: int = ADMISSION_GLOBAL_LIMIT, user_limit: int = ADMISSION_USER_LIMIT,
+                 queue_size: int = ADMISSION_QUEUE_SIZE, user_queue_size: int = ADMISSION_USER_QUEUE_SIZE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.global_limit = global_limit
+        self.user_limit = user_limit
+        self.queue_size = queue_size
+        self.user_queue_size = user_queue_size
+        self.queue_timeout = queue_timeout
+        self._global = None
+        self._users: Dict[str, _UserSlots] = {}
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "timeout": 0}
+
+    def _reject(self, reason: str):
+        self.shed[reason] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado. Tente novamente em instantes.",
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER)}
+        )
+
+    def _release_user(self, user_id: str, user: _UserSlots):
+        if not user.active and not user.waiting and self._users.get(user_id) is user:
+            del self._users[user_id]
+
+    async def _wait_for_slot(self, user_id: str, user: _UserSlots):
+        if self.waiting >= self.queue_size or user.waiting >= self.user_queue_size:
+            self._release_user(user_id, user)
+            self._reject("queue_full")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        self.waiting += 1
+        user.waiting += 1
+        admitted = False
+        try:
+            await asyncio.wait_for(user.semaphore.acquire(), timeout=self.queue_timeout)
+            try:
+                await asyncio.wait_for(self._global.acquire(), timeout=max(deadline - loop.time(), 0))
+            except BaseException:
+                user.semaphore.release()
+                raise
+            admitted = True
+            user.active += 1
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+        finally:
+            self.waiting -= 1
+            user.waiting -= 1
+            if not admitted:
+                self._release_user(user_id, user)
+
+    @asynccontextmanager
+    async def admit(self, user_id: str):
+        """Ocupar uma vaga global e uma do usuário durante o bloco"""
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.global_limit)
+        user = self._users.get(user_id)
+        if user is None:
+            user = self._users[user_id] = _UserSlots(self.user_limit)
+
+        # Fast path only with nobody queued: on Python 3.10 ``locked()``
+        # ignores waiters, so a newcomer could take a freed slot ahead of them
+        if (self.waiting == 0 and user.waiting == 0
+                and not user.semaphore.locked() and not self._global.locked()):
+            # Both acquisitions complete without yielding
+            await user.semaphore.acquire()
+            await self._global.acquire()
+            user.active += 1
+        else:
+            await self._wait_for_slot(user_id, user)
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self._global.release()
+            user.semaphore.release()
+            self.in_flight -= 1
+            user.active -= 1
+            self._release_user(user_id, user)
+
+    def metrics(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "users_active": len(self._users),
+            "admitted_total": self.admitted,
+            "shed_total": dict(self.shed),
+            "limits": {
+                "global": self.global_limit,
+                "per_user": self.user_limit,
+                "queue": self.queue_size,
+                "per_user_queue": self.user_queue_size,
+                "queue_timeout_s": self.queue_timeout,
+            },
+        }
+
+# Global controller for upstream-heavy routes
+admission = AdmissionController()
+
+async def admission_control(current_user: dict = Depends(get_current_user)):
+    """Dependência que aplica o controle de admissão por usuário"""
+    async with admission.admit(current_user["id"]):
+        yield
@@ -1,25 +1,122 @@
 import os
 import json
+import time
+import asyncio
+import threading
 import redis
 from typing import Any, Optional
-from datetime import timedelta
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 # Redis configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour default
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "2"))  # seconds
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", "30"))  # seconds between reconnects
+MAX_PENDING_DELETES = 10000  # beyond this, flush Redis on reconnect instead
 
 class CacheService:
-    def __init__(self):
+    """Cache com Redis e fallback em memória.
+
+    A conexão com o Redis é feita sob demanda (``connect``), normalmente no
+    lifespan da aplicação; enquanto ela não estiver disponível o cache em
+    memória é usado e ``reconnect_loop`` tenta reconectar periodicamente.
+    Invalidações feitas nesse período são reaplicadas no Redis ao reconectar.
+    """
+
+    def __init__(self, url: str = REDIS_URL):
+        self.url = url
+        self.redis_client = None
+        self.memory_cache = {}
+        self.enabled = False
+        self.last_error: Optional[str] = None
+        self.connected_at: Optional[float] = None
+        # Invalidations made while degraded, replayed on reconnect
+        self.pending_deletes = set()
+        self.pending_flush = False
+        self._lock = threading.Lock()
+
+    def connect(self, timeout: float = REDIS_CONNECT_TIMEOUT) -> bool:
+        """Conectar ao Redis com timeout limitado (bloqueante)"""
+        if not self.url:
+            return False
         try:
-            self.redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-            # Test connection
-            self.redis_client.ping()
-            self.enabled = True
-        except (redis.ConnectionError, redis.TimeoutError):
-            # Fallback to in-memory cache if Redis is not available
-            self.memory_cache = {}
+            client = redis.from_url(
+                self.url,
+                decode_responses=True,
+                socket_connect_timeout=timeout,
+                socket_timeout=timeout
+            )
+            client.ping()
+            self._replay_invalidations(client)
+        except (redis.ConnectionError, redis.TimeoutError, OSError) as e:
+            if self.last_error is None:
+                logger.warning(f"Redis not available, using in-memory cache: {e}")
+            self.last_error = str(e)
             self.enabled = False
-            print("Warning: Redis not available, using in-memory cache")
+            return False
+
+        self.last_error = None
+        self.connected_at = time.time()
+        logger.info("Connected to Redis cache")
+        return True
+
+    def _replay_invalidations(self, client):
+        """Aplicar no Redis as invalidações feitas em modo memória e ativá-lo.
+
+        O lock só protege a troca dos pendentes e a ativação; as chamadas de
+        rede ficam fora dele para não travar delete()/clear() no event loop.
+        Invalidações feitas durante o replay entram na próxima rodada.
+        """
+        while True:
+            with self._lock:
+                pending, self.pending_deletes = self.pending_deletes, set()
+                flush, self.pending_flush = self.pending_flush, False
+                if not pending and not flush:
+                    self.redis_client = client
+                    self.enabled = True
+                    # Entries written while degraded may be stale once Redis is back
+                    self.memory_cache.clear()
+                    return
+            try:
+                if flush:
+                    client.flushdb()
+                else:
+                    keys = list(pending)
+                    for i in range(0, len(keys), 500):
+                        client.delete(*keys[i:i + 500])
+                    logger.info(f"Replayed {len(keys)} cache invalidations after reconnect")
+            except Exception:
+                with self._lock:
+                    if flush or self.pending_flush:
+                        self.pending_flush = True
+                        self.pending_deletes.clear()
+                    else:
+                        self.pending_deletes |= pending
+                raise
+
+    async def reconnect_loop(self, interval: float = REDIS_RETRY_INTERVAL):
+        """Tentar reconectar ao Redis enquanto estiver em modo memória"""
+        while True:
+            await asyncio.sleep(interval)
+            if not self.enabled and self.url:
+                await asyncio.to_thread(self.connect)
+
+    def _degrade(self, error: Exception):
+        """Voltar para o cache em memória após falha de conexão"""
+        logger.warning(f"Redis connection lost, falling back to in-memory cache: {error}")
+        self.enabled = False
+        self.last_error = str(error)
+
+    def status(self) -> dict:
+        """Estado atual do cache (usado pelo /ready)"""
+        return {
+            "backend": "redis" if self.enabled else "memory",
+            "redis_configured": bool(self.url),
+            "connected_at": self.connected_at if self.enabled else None,
+            "last_error": self.last_error,
+        }
 
     def get(self, key: str) -> Optional[Any]:
         """Obter valor do cache"""
@@ -29,9 +126,16 @@ class CacheService:
                 if value:
                     return json.loads(value)
             else:
-                return self.memory_cache.get(key)
+                entry = self.memory_cache.get(key)
+                if entry is not None:
+                    expires_at, value = entry
+                    if expires_at > time.monotonic():
+                        return value
+                    self.memory_cache.pop(key, None)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._degrade(e)
         except Exception as e:
-            print(f"Cache get error: {e}")
+            logger.error(f"Cache get error: {e}")
         return None
 
     def set(self, key: str, value: Any, ttl: int = CACHE_TTL) -> bool:
@@ -41,38 +145,79 @@ class CacheService:
                 serialized = json.dumps(value, default=str)
                 return self.redis_client.setex(key, ttl, serialized)
             else:
-                self.memory_cache[key] = value
+                self.memory_cache[key] = (time.monotonic() + ttl, value)
                 return True
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._degrade(e)
         except Exception as e:
-            print(f"Cache set error: {e}")
-            return False
+            logger.error(f"Cache set error: {e}")
+        return False
 
     def delete(self, key: str) -> bool:
         """Deletar chave do cache"""
         try:
-            if self.enabled:
-                return bool(self.redis_client.delete(key))
-            else:
-                return self.memory_cache.pop(key, None) is not None
+            if not self.enabled:
+                deleted = self._delete_degraded(key)
+                if deleted is not None:
+                    return deleted
+            return bool(self.redis_client.delete(key))
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._degrade(e)
+            return bool(self._delete_degraded(key))
         except Exception as e:
-            print(f"Cache delete error: {e}")
-            return False
+            logger.error(f"Cache delete error: {e}")
+        return False
+
+    def _delete_degraded(self, key: str) -> Optional[bool]:
+        """Deletar em memória e lembrar de deletar no Redis ao reconectar.
+
+        Retorna None se a conexão foi restabelecida nesse meio tempo.
+        """
+        with self._lock:
+            if self.enabled:
+                return None
+            if self.url and not self.pending_flush:
+                self.pending_deletes.add(key)
+                if len(self.pending_deletes) > MAX_PENDING_DELETES:
+                    self.pending_flush = True
+                    self.pending_deletes.clear()
+            return self.memory_cache.pop(key, None) is not None
 
     def clear(self) -> bool:
         """Limpar todo o cache"""
         try:
-            if self.enabled:
-                return self.redis_client.flushdb()
-            else:
-                self.memory_cache.clear()
+            self.memory_cache.clear()
+            if not self.enabled and self._clear_degraded():
                 return True
+            return self.redis_client.flushdb()
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._degrade(e)
+            return self._clear_degraded()
         except Exception as e:
-            print(f"Cache clear error: {e}")
-            return False
+            logger.error(f"Cache clear error: {e}")
+        return False
+
+    def _clear_degraded(self) -> bool:
+        """Lembrar de limpar o Redis ao reconectar (False se já reconectou)"""
+        with self._lock:
+            if self.enabled:
+                return False
+            self.pending_flush = True
+            self.pending_deletes.clear()
+            return True
+
+    def close(self):
+        """Fechar conexão com o Redis"""
+        if self.redis_client is not None:
+            try:
+                self.redis_client.close()
+            except Exception as e:
+                logger.error(f"Cache close error: {e}")
+        self.enabled = False
 
     def get_cache_key(self, prefix: str, *args) -> str:
         """Gerar chave de cache padronizada"""
         return f"{prefix}:{'_'.join(map(str, args))}"
 
-# Global cache instance
-cache = CacheService()
\ No newline at end of file
+# Global cache instance (connected in the application lifespan)
+cache = CacheService()
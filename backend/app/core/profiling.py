@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import hmac
+import time
+import uuid
+import random
+import asyncio
+import threading
+import contextvars
+from collections import Counter
+from urllib.parse import urlencode
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from app.core.logging import get_logger
+from app.core.security import ADMIN_TOKEN
+
+logger = get_logger(__name__)
+
+# Profiling configuration
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # fraction of requests profiled
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/financial-insights-profiles")
+PROFILE_DIR_MAX_MB = float(os.getenv("PROFILE_DIR_MAX_MB", "50"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "2000"))
+
+# Upstream calls made while handling the current request
+_spans: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("upstream_spans", default=None)
+
+def record_span(endpoint: str, started: float, status: Any, cache_hit: bool = False, **extra):
+    """Registrar chamada ao upstream na requisição atual"""
+    spans = _spans.get()
+    if spans is not None:
+        spans.append({
+            "endpoint": endpoint,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "status": status,
+            "cache_hit": cache_hit,
+            **extra
+        })
+
+class StackSampler:
+    """Profiler por amostragem da thread do event loop.
+
+    Stacks são acumuladas no formato "collapsed" (flamegraph.pl/speedscope).
+    As amostras cobrem tudo que roda no event loop durante a requisição,
+    inclusive outras requisições concorrentes.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.target = threading.get_ident()
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+class ProfileStore:
+    """Diretório de perfis com limite de tamanho (remove os mais antigos)"""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_mb: float = PROFILE_DIR_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def save(self, profile: Dict[str, Any]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{profile['id']}.json")
+        with open(path, "w") as f:
+            json.dump(profile, f)
+        self._enforce_limit()
+        return path
+
+    def _entries(self) -> List[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return []
+        with os.scandir(self.directory) as it:
+            entries = [e for e in it if e.is_file() and e.name.endswith(".json")]
+        return sorted(entries, key=lambda e: e.stat().st_mtime, reverse=True)
+
+    def _enforce_limit(self):
+        total = 0
+        for entry in self._entries():
+            total += entry.stat().st_size
+            if total > self.max_bytes:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        profiles = []
+        for entry in self._entries()[:limit]:
+            try:
+                with open(entry.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            data.pop("collapsed", None)
+            data["size_bytes"] = entry.stat().st_size
+            profiles.append(data)
+        return profiles
+
+    def load(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        # Ids are generated by us; reject anything that could escape the directory
+        if not profile_id.isalnum():
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.json")
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+store = ProfileStore()
+_active_profiles = 0
+
+def _should_profile(request: Request) -> bool:
+    if ADMIN_TOKEN and hmac.compare_digest(request.headers.get("x-profile", ""), ADMIN_TOKEN):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+async def profiling_middleware(request: Request, call_next):
+    """Perfila requisições sob demanda e captura requisições lentas"""
+    global _active_profiles
+
+    spans: List[Dict[str, Any]] = []
+    token = _spans.set(spans)
+
+    sampler = None
+    if _should_profile(request) and _active_profiles < PROFILE_MAX_CONCURRENT:
+        _active_profiles += 1
+        sampler = StackSampler()
+        sampler.start()
+
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        _spans.reset(token)
+        if sampler:
+            sampler.stop()
+            _active_profiles -= 1
+
+    slow = duration_ms >= SLOW_REQUEST_THRESHOLD_MS
+    if sampler or slow:
+        profile = {
+            "id": uuid.uuid4().hex,
+            "timestamp": time.time(),
+            "method": request.method,
+            "path": request.url.path,
+            # Never persist credentials passed in the query string (SSE stream token)
+            "query": urlencode([(k, v) for k, v in request.query_params.multi_items() if k != "token"]),
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "reason": "slow" if slow and not sampler else "sampled",
+            "upstream_ms": round(sum(s["duration_ms"] for s in spans), 2),
+            "spans": spans,
+            "samples": sum(sampler.samples.values()) if sampler else 0,
+            "collapsed": sampler.collapsed() if sampler else "",
+        }
+        try:
+            await asyncio.to_thread(store.save, profile)
+            response.headers["X-Profile-Id"] = profile["id"]
+            if slow:
+                logger.warning(f"Slow request captured: {request.method} {request.url.path} "
+                               f"{profile['duration_ms']}ms (profile {profile['id']})")
+        except OSError as e:
+            logger.error(f"Error saving profile: {str(e)}")
+
+    return response
@@ -1,17 +1,24 @@
 import os
+import hmac
+import hashlib
+import secrets
 import jwt
 import bcrypt
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Header, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import cache
 
 # Security settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # empty disables admin endpoints
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", "300"))
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Criar token JWT"""
@@ -52,6 +59,41 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     
     return {"id": user_id, "organizze_token": payload.get("organizze_token")}
 
+def _stream_token_key(token: str) -> str:
+    return cache.get_cache_key("stream_token", hashlib.sha256(token.encode('utf-8')).hexdigest())
+
+def create_stream_token(user: dict) -> str:
+    """Criar token opaco e de curta duração que só vale para o stream SSE.
+
+    Ele vai na URL (EventSource não envia headers), então não carrega o JWT
+    de sessão nem a chave do Organizze; o usuário fica guardado no cache.
+    """
+    token = secrets.token_urlsafe(32)
+    cache.set(_stream_token_key(token), user, ttl=STREAM_TOKEN_EXPIRE_SECONDS)
+    return token
+
+def get_current_user_sse(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    token: Optional[str] = Query(None, description="Token de stream (POST /api/stream/token)")
+):
+    """Como get_current_user, aceitando também um token de stream na query string"""
+    if credentials is not None:
+        return get_current_user(credentials)
+    
+    user = cache.get(_stream_token_key(token)) if token else None
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Token de stream ausente ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependência para endpoints administrativos (header X-Admin-Token)"""
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+
 def hash_token(token: str) -> str:
     """Hash de token para armazenamento seguro"""
     return bcrypt.hashpw(token.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
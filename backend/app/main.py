@@ -1,6 +1,12 @@
 import os
 import time
-from fastapi import FastAPI, Request, HTTPException, status
+
+# Boot clock for startup phase timings
+_boot_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, HTTPException, status
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,8 +17,12 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
-from app.routers import organizze, auth, analytics
+from app.routers import organizze, auth, analytics, admin, stream
 from app.core.logging import setup_logging, get_logger, log_api_call
+from app.core.cache import cache, REDIS_CONNECT_TIMEOUT
+from app.core.profiling import profiling_middleware
+from app.services.cache_warmup import warmer
+from app.services.live_updates import broadcaster
 
 # Setup logging first
 setup_logging()
@@ -21,13 +31,48 @@ logger = get_logger(__name__)
 # Rate limiting
 limiter = Limiter(key_func=get_remote_address)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    logger.info("Financial Insights API starting up")
+    logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
+    logger.info(f"CORS Origins: {os.getenv('CORS_ORIGINS', 'localhost origins')}")
+    
+    phases = app.state.startup["phases_ms"]
+    phases["imports"] = round((time.perf_counter() - _boot_started) * 1000, 2)
+    
+    # Connect to Redis off the event loop; a slow or missing Redis only
+    # delays boot by the connect timeout and is retried in background
+    phase_started = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(cache.connect), timeout=REDIS_CONNECT_TIMEOUT + 1)
+    except asyncio.TimeoutError:
+        logger.warning("Redis connection timed out, starting with in-memory cache")
+    phases["cache_connect"] = round((time.perf_counter() - phase_started) * 1000, 2)
+    reconnect_task = asyncio.create_task(cache.reconnect_loop(), name="cache-reconnect")
+    
+    phases["total"] = round((time.perf_counter() - _boot_started) * 1000, 2)
+    app.state.startup["ready"] = True
+    logger.info(f"Startup completed in {phases['total']}ms: {phases}")
+    
+    yield
+    
+    logger.info("Financial Insights API shutting down")
+    app.state.startup["ready"] = False
+    reconnect_task.cancel()
+    await warmer.shutdown()
+    await broadcaster.shutdown()
+    cache.close()
+
 app = FastAPI(
     title="Financial Insights API", 
     version="1.0.0",
     description="API para análise financeira integrada com Organizze",
     docs_url="/docs" if os.getenv("ENVIRONMENT") != "production" else None,
-    redoc_url="/redoc" if os.getenv("ENVIRONMENT") != "production" else None
+    redoc_url="/redoc" if os.getenv("ENVIRONMENT") != "production" else None,
+    lifespan=lifespan
 )
+app.state.startup = {"ready": False, "phases_ms": {}}
 
 # Rate limiting middleware
 app.state.limiter = limiter
@@ -52,6 +97,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling / slow request capture (registered first, so it runs innermost)
+app.middleware("http")(profiling_middleware)
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -76,6 +124,8 @@ async def add_process_time_header(request: Request, call_next):
 app.include_router(auth.router, prefix="/api/auth")
 app.include_router(organizze.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api/analytics")
+app.include_router(admin.router, prefix="/api/admin")
+app.include_router(stream.router, prefix="/api/stream")
 
 # Serve static assets
 frontend_dist = os.path.join(os.path.dirname(__file__), "../../frontend/dist")
@@ -99,6 +149,23 @@ async def health_check(request: Request):
         "environment": os.getenv("ENVIRONMENT", "development")
     }
 
+# Readiness check
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness endpoint with dependency state"""
+    cache_status = cache.status()
+    ready = app.state.startup["ready"]
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    # Redis is optional: running on the in-memory fallback is degraded, not unready
+    degraded = cache_status["redis_configured"] and cache_status["backend"] != "redis"
+    return {
+        "status": "starting" if not ready else ("degraded" if degraded else "ready"),
+        "dependencies": {"cache": cache_status},
+        "startup_phases_ms": app.state.startup["phases_ms"],
+    }
+
 # API info
 @app.get("/")
 @limiter.limit("30/minute")
@@ -116,7 +183,7 @@ async def root(request: Request):
 async def spa_fallback(full_path: str, request: Request):
     """Single Page Application fallback"""
     # Skip API and static routes
-    if request.url.path.startswith(("/api", "/static", "/health")):
+    if request.url.path.startswith(("/api", "/static", "/health", "/ready")):
         raise HTTPException(status_code=404, detail="Endpoint not found")
     
     # Verificar se o arquivo index.html existe
@@ -126,17 +193,3 @@ async def spa_fallback(full_path: str, request: Request):
         raise HTTPException(status_code=404, detail="Frontend not built")
     
     return FileResponse(index_path)
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Application startup"""
-    logger.info("Financial Insights API starting up")
-    logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
-    logger.info(f"CORS Origins: {os.getenv('CORS_ORIGINS', 'localhost origins')}")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown"""
-    logger.info("Financial Insights API shutting down")
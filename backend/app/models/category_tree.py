@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+NO_PARENT = -1
+
+class CategoryTree:
+    """Índice da árvore de categorias com cadeias de ancestrais pré-calculadas.
+
+    Cada categoria recebe um slot denso (0..n-1); ``ancestors[slot]`` guarda os
+    slots da raiz até a própria categoria, de modo que o nó de qualquer
+    profundidade é obtido por indexação direta.
+    """
+
+    def __init__(self, categories: List[Dict[str, Any]]):
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.colors: List[Optional[str]] = []
+        self.slots: Dict[int, int] = {}
+        for category in categories:
+            if category.get('id') is None or category['id'] in self.slots:
+                continue
+            self.slots[category['id']] = len(self.ids)
+            self.ids.append(category['id'])
+            self.names.append(category.get('name') or '')
+            self.colors.append(category.get('color'))
+
+        parent_ids = {c.get('id'): c.get('parent_id') for c in categories}
+        self.parents: List[int] = self._break_cycles(
+            [self.slots.get(parent_ids.get(cid), NO_PARENT) for cid in self.ids]
+        )
+        self.ancestors: List[Tuple[int, ...]] = [self._chain(slot) for slot in range(len(self.ids))]
+        self.has_children: List[bool] = [False] * len(self.ids)
+        for slot, chain in enumerate(self.ancestors):
+            if len(chain) > 1:
+                self.has_children[chain[-2]] = True
+
+    def _break_cycles(self, parents: List[int]) -> List[int]:
+        """Cortar ciclos dos dados de origem, tornando raiz o nó de menor id de cada ciclo.
+
+        A escolha depende só do ciclo (não da ordem de entrada), e categorias
+        que apontam para o ciclo continuam passando por ele.
+        """
+        parents = list(parents)
+        state = [0] * len(parents)  # 0 = unvisited, 1 = on current path, 2 = done
+        for start in range(len(parents)):
+            path = []
+            slot = start
+            while slot != NO_PARENT and state[slot] == 0:
+                state[slot] = 1
+                path.append(slot)
+                slot = parents[slot]
+            if slot != NO_PARENT and state[slot] == 1:
+                cycle = path[path.index(slot):]
+                parents[min(cycle, key=lambda s: self.ids[s])] = NO_PARENT
+            for visited in path:
+                state[visited] = 2
+        return parents
+
+    def _chain(self, slot: int) -> Tuple[int, ...]:
+        chain = [slot]
+        parent = self.parents[slot]
+        while parent != NO_PARENT:
+            chain.append(parent)
+            parent = self.parents[parent]
+        return tuple(reversed(chain))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def slot(self, category_id: Optional[int]) -> Optional[int]:
+        return self.slots.get(category_id) if category_id is not None else None
+
+    def depth(self, slot: int) -> int:
+        """Profundidade do nó (raízes = 0)"""
+        return len(self.ancestors[slot]) - 1
+
+    def node(self, slot: int) -> Dict[str, Any]:
+        parent = self.parents[slot]
+        return {
+            "id": self.ids[slot],
+            "name": self.names[slot],
+            "color": self.colors[slot],
+            "parent_id": self.ids[parent] if parent != NO_PARENT else None,
+            "depth": self.depth(slot),
+            "has_children": self.has_children[slot],
+        }
+
+    def rollup(self, totals: Dict[Optional[int], Tuple[int, int]], depth: int = 1,
+               parent: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Somar totais por categoria até ``depth`` níveis abaixo das raízes (ou de ``parent``).
+
+        ``totals`` mapeia category_id -> (receitas, despesas) em centavos.
+        Categorias desconhecidas ou ausentes vão para "Outros" quando não há
+        ``parent``.
+        """
+        parent_slot = self.slot(parent) if parent is not None else None
+        if parent is not None and parent_slot is None:
+            raise KeyError(parent)
+        base = self.depth(parent_slot) + 1 if parent_slot is not None else 0
+        target_depth = base + max(depth, 1) - 1
+
+        income = [0] * len(self.ids)
+        expenses = [0] * len(self.ids)
+        touched = set()
+        other = [0, 0]
+
+        for category_id, (category_income, category_expenses) in totals.items():
+            slot = self.slot(category_id)
+            if slot is None:
+                if parent_slot is None:
+                    other[0] += category_income
+                    other[1] += category_expenses
+                continue
+
+            chain = self.ancestors[slot]
+            if parent_slot is not None and (len(chain) < base or chain[base - 1] != parent_slot):
+                continue
+            # Transactions booked directly on the parent stay on the parent
+            node = chain[min(target_depth, len(chain) - 1)]
+            income[node] += category_income
+            expenses[node] += category_expenses
+            touched.add(node)
+
+        result = []
+        for slot in touched:
+            entry = self.node(slot)
+            entry["income"] = income[slot] / 100
+            entry["expenses"] = expenses[slot] / 100
+            result.append(entry)
+        if other[0] or other[1]:
+            result.append({
+                "id": None, "name": "Outros", "color": None, "parent_id": None,
+                "depth": 0, "has_children": False,
+                "income": other[0] / 100, "expenses": other[1] / 100,
+            })
+        result.sort(key=lambda e: e["expenses"], reverse=True)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "categories": [
+                {"id": cid, "name": name, "color": color,
+                 "parent_id": self.ids[parent] if parent != NO_PARENT else None}
+                for cid, name, color, parent in zip(self.ids, self.names, self.colors, self.parents)
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CategoryTree":
+        return cls(data.get("categories", []))
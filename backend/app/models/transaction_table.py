@@ -0,0 +1,268 @@
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+NO_ID = -1  # missing account/category id
+
+def to_epoch_day(value: str) -> int:
+    """Converter data ISO (YYYY-MM-DD[...]) em dias desde 1970-01-01"""
+    return date.fromisoformat(value[:10]).toordinal() - EPOCH_ORDINAL
+
+def from_epoch_day(day: int) -> date:
+    return date.fromordinal(day + EPOCH_ORDINAL)
+
+class TransactionRow:
+    """View leve de uma linha da tabela (não copia dados)"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TransactionTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._index]
+
+    @property
+    def amount_cents(self) -> int:
+        return self._table.cents[self._index]
+
+    @property
+    def amount(self) -> float:
+        return self._table.cents[self._index] / 100
+
+    @property
+    def account_id(self) -> Optional[int]:
+        value = self._table.account_ids[self._index]
+        return None if value == NO_ID else value
+
+    @property
+    def category_id(self) -> Optional[int]:
+        value = self._table.category_ids[self._index]
+        return None if value == NO_ID else value
+
+    @property
+    def day(self) -> int:
+        return self._table.days[self._index]
+
+    @property
+    def date(self) -> date:
+        return from_epoch_day(self._table.days[self._index])
+
+    @property
+    def description(self) -> str:
+        return self._table.descriptions[self._table.description_ids[self._index]]
+
+    @property
+    def paid(self) -> bool:
+        return bool(self._table.paid[self._index])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._table.to_dict(self._index)
+
+class TransactionTable:
+    """Transações em colunas tipadas (array) com descrições internadas.
+
+    Ocupa algumas dezenas de bytes por transação, contra centenas para uma
+    lista de dicts, e permite agregar e filtrar sem materializar dicts.
+    """
+
+    def __init__(self, descriptions: Optional[List[str]] = None):
+        self.ids = array("q")
+        self.cents = array("q")
+        self.account_ids = array("q")
+        self.category_ids = array("q")
+        self.days = array("l")
+        self.description_ids = array("l")
+        self.paid = array("b")
+        # Interned descriptions are append-only and shared with derived tables
+        self.descriptions: List[str] = descriptions if descriptions is not None else []
+        self._description_index: Dict[str, int] = {d: i for i, d in enumerate(self.descriptions)}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict[str, Any]]) -> "TransactionTable":
+        table = cls()
+        table.extend(transactions)
+        return table
+
+    def _intern(self, description: str) -> int:
+        index = self._description_index.get(description)
+        if index is None:
+            index = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_index[description] = index
+        return index
+
+    def append(self, transaction: Dict[str, Any]):
+        """Adicionar uma transação no formato da API do Organizze"""
+        cents = transaction.get('amount_cents')
+        if cents is None:
+            cents = round(float(transaction.get('amount', 0) or 0) * 100)
+        account_id = transaction.get('account_id')
+        category_id = transaction.get('category_id')
+
+        self.ids.append(int(transaction.get('id', 0) or 0))
+        self.cents.append(int(cents))
+        self.account_ids.append(NO_ID if account_id is None else int(account_id))
+        self.category_ids.append(NO_ID if category_id is None else int(category_id))
+        self.days.append(to_epoch_day(transaction.get('date', '')))
+        self.description_ids.append(self._intern(transaction.get('description') or ''))
+        self.paid.append(1 if transaction.get('paid', True) else 0)
+
+    def extend(self, transactions: Iterable[Dict[str, Any]]):
+        for transaction in transactions:
+            self.append(transaction)
+
+    def concat(self, other: "TransactionTable"):
+        """Anexar outra tabela (re-internando as descrições)"""
+        self.ids.extend(other.ids)
+        self.cents.extend(other.cents)
+        self.account_ids.extend(other.account_ids)
+        self.category_ids.extend(other.category_ids)
+        self.days.extend(other.days)
+        self.paid.extend(other.paid)
+        if other.descriptions is self.descriptions:
+            self.description_ids.extend(other.description_ids)
+        else:
+            remap = [self._intern(d) for d in other.descriptions]
+            self.description_ids.extend(remap[i] for i in other.description_ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for index in range(len(self)):
+            yield TransactionRow(self, index)
+
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        cents = self.cents[index]
+        account_id = self.account_ids[index]
+        category_id = self.category_ids[index]
+        return {
+            "id": self.ids[index],
+            "description": self.descriptions[self.description_ids[index]],
+            "date": from_epoch_day(self.days[index]).isoformat(),
+            "paid": bool(self.paid[index]),
+            "amount_cents": cents,
+            "amount": cents / 100,
+            "account_id": None if account_id == NO_ID else account_id,
+            "category_id": None if category_id == NO_ID else category_id,
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.to_dict(i) for i in range(len(self))]
+
+    # Filtering
+
+    def take(self, indices: Iterable[int]) -> "TransactionTable":
+        """Nova tabela com as linhas selecionadas (descrições compartilhadas)"""
+        table = TransactionTable(self.descriptions)
+        table._description_index = self._description_index
+        for i in indices:
+            table.ids.append(self.ids[i])
+            table.cents.append(self.cents[i])
+            table.account_ids.append(self.account_ids[i])
+            table.category_ids.append(self.category_ids[i])
+            table.days.append(self.days[i])
+            table.description_ids.append(self.description_ids[i])
+            table.paid.append(self.paid[i])
+        return table
+
+    def filter(self, start: Optional[date] = None, end: Optional[date] = None,
+               category_ids: Optional[Iterable[int]] = None) -> "TransactionTable":
+        """Filtrar por intervalo de datas (inclusivo) e/ou categorias"""
+        lo = start.toordinal() - EPOCH_ORDINAL if start else None
+        hi = end.toordinal() - EPOCH_ORDINAL if end else None
+        wanted = set(category_ids) if category_ids is not None else None
+        days, categories = self.days, self.category_ids
+        return self.take(
+            i for i in range(len(self))
+            if (lo is None or days[i] >= lo)
+            and (hi is None or days[i] <= hi)
+            and (wanted is None or categories[i] in wanted)
+        )
+
+    # Aggregations (all amounts in cents)
+
+    def totals(self) -> Tuple[int, int]:
+        """(receitas, despesas) em centavos, despesas como valor positivo"""
+        income = expenses = 0
+        for cents in self.cents:
+            if cents > 0:
+                income += cents
+            else:
+                expenses -= cents
+        return income, expenses
+
+    def sum_by_category(self, absolute: bool = True) -> Dict[Optional[int], int]:
+        totals: Dict[Optional[int], int] = {}
+        for category_id, cents in zip(self.category_ids, self.cents):
+            key = None if category_id == NO_ID else category_id
+            totals[key] = totals.get(key, 0) + (abs(cents) if absolute else cents)
+        return totals
+
+    def totals_by_category(self) -> Dict[Optional[int], Tuple[int, int]]:
+        """{category_id: (receitas, despesas)} em centavos"""
+        totals: Dict[Optional[int], List[int]] = {}
+        for category_id, cents in zip(self.category_ids, self.cents):
+            key = None if category_id == NO_ID else category_id
+            bucket = totals.get(key)
+            if bucket is None:
+                bucket = totals[key] = [0, 0]
+            if cents > 0:
+                bucket[0] += cents
+            else:
+                bucket[1] -= cents
+        return {key: (income, expenses) for key, (income, expenses) in totals.items()}
+
+    def totals_by_month(self) -> Dict[str, Tuple[int, int]]:
+        """{'YYYY-MM': (receitas, despesas)} em centavos"""
+        month_of_day: Dict[int, str] = {}
+        totals: Dict[str, List[int]] = {}
+        for day, cents in zip(self.days, self.cents):
+            month = month_of_day.get(day)
+            if month is None:
+                month = month_of_day[day] = from_epoch_day(day).strftime('%Y-%m')
+            bucket = totals.get(month)
+            if bucket is None:
+                bucket = totals[month] = [0, 0]
+            if cents > 0:
+                bucket[0] += cents
+            else:
+                bucket[1] -= cents
+        return {month: (income, expenses) for month, (income, expenses) in totals.items()}
+
+    # Serialization (compact JSON for the cache)
+
+    def to_columns(self) -> Dict[str, Any]:
+        return {
+            "ids": self.ids.tolist(),
+            "cents": self.cents.tolist(),
+            "account_ids": self.account_ids.tolist(),
+            "category_ids": self.category_ids.tolist(),
+            "days": self.days.tolist(),
+            "description_ids": self.description_ids.tolist(),
+            "paid": self.paid.tolist(),
+            "descriptions": self.descriptions,
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "TransactionTable":
+        table = cls(list(columns["descriptions"]))
+        table.ids = array("q", columns["ids"])
+        table.cents = array("q", columns["cents"])
+        table.account_ids = array("q", columns["account_ids"])
+        table.category_ids = array("q", columns["category_ids"])
+        table.days = array("l", columns["days"])
+        table.description_ids = array("l", columns["description_ids"])
+        table.paid = array("b", columns["paid"])
+        return table
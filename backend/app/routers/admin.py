@@ -0,0 +1,37 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse
+from app.core.security import require_admin
+from app.core.profiling import store
+from app.core.admission import admission
+from app.core.logging import get_logger
+
+router = APIRouter(tags=["Administração"], dependencies=[Depends(require_admin)])
+logger = get_logger(__name__)
+
+@router.get("/profiles")
+async def list_profiles(limit: int = Query(50, ge=1, le=500, description="Quantidade máxima de perfis")):
+    """Listar perfis e requisições lentas capturadas"""
+    return {"profiles": await asyncio.to_thread(store.list, limit=limit)}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|collapsed)$", description="json ou collapsed (flamegraph)")
+):
+    """Baixar um perfil capturado"""
+    profile = await asyncio.to_thread(store.load, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    
+    if format == "collapsed":
+        return PlainTextResponse(
+            profile.get("collapsed", ""),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed.txt"'}
+        )
+    return profile
+
+@router.get("/metrics")
+async def get_metrics():
+    """Métricas de controle de admissão (fila, vagas ocupadas, requisições descartadas)"""
+    return {"admission": admission.metrics()}
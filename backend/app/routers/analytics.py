@@ -1,13 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import datetime
 from app.core.security import get_current_user
-from app.services.organizze_api import OrganizzeAPI
+from app.core.admission import admission_control
+from app.services.organizze_api import OrganizzeAPI, previous_month, months_in_range, MAX_RANGE_MONTHS
 from app.core.cache import cache
 from app.core.logging import get_logger
+from app.services.budget_analysis import analyze_budgets
+from app.services.financial_summary import build_financial_summary, SUMMARY_CACHE_TTL
 
-router = APIRouter(tags=["Análises"], dependencies=[Depends(get_current_user)])
+router = APIRouter(tags=["Análises"], dependencies=[Depends(get_current_user), Depends(admission_control)])
 logger = get_logger(__name__)
 
 @router.get("/summary")
@@ -22,57 +24,8 @@ async def get_financial_summary(current_user: dict = Depends(get_current_user)):
         if cached_summary:
             return cached_summary
         
-        # Fetch data from API
-        accounts_data = await api.get_accounts()
-        transactions_data = await api.get_transactions(per_page=100)
-        categories_data = await api.get_categories()
-        
-        # Calculate summary
-        total_balance = sum(
-            Decimal(str(account.get('balance', 0))) 
-            for account in accounts_data.get('accounts', [])
-        )
-        
-        # Get current month transactions
-        current_month = datetime.now().replace(day=1)
-        monthly_income = Decimal('0')
-        monthly_expenses = Decimal('0')
-        
-        for transaction in transactions_data.get('transactions', []):
-            amount = Decimal(str(transaction.get('amount', 0)))
-            if amount > 0:
-                monthly_income += amount
-            else:
-                monthly_expenses += abs(amount)
-        
-        # Category summary
-        category_totals = {}
-        for transaction in transactions_data.get('transactions', []):
-            category_id = transaction.get('category_id')
-            amount = abs(Decimal(str(transaction.get('amount', 0))))
-            
-            if category_id and amount > 0:
-                category_name = next(
-                    (cat['name'] for cat in categories_data.get('categories', []) 
-                     if cat['id'] == category_id), 
-                    'Outros'
-                )
-                category_totals[category_name] = category_totals.get(category_name, 0) + float(amount)
-        
-        summary = {
-            "total_balance": float(total_balance),
-            "monthly_income": float(monthly_income),
-            "monthly_expenses": float(monthly_expenses),
-            "net_income": float(monthly_income - monthly_expenses),
-            "budget_used": min(100, (float(monthly_expenses) / max(float(monthly_income), 1)) * 100),
-            "categories_summary": [
-                {"name": name, "value": value, "color": _get_category_color(i)}
-                for i, (name, value) in enumerate(sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:5])
-            ]
-        }
-        
-        # Cache for 30 minutes
-        cache.set(cache_key, summary, ttl=1800)
+        summary = await build_financial_summary(api)
+        cache.set(cache_key, summary, ttl=SUMMARY_CACHE_TTL)
         
         return summary
         
@@ -82,37 +35,30 @@ async def get_financial_summary(current_user: dict = Depends(get_current_user)):
 
 @router.get("/trends")
 async def get_spending_trends(
-    months: int = 6,
+    months: int = Query(6, ge=1, le=MAX_RANGE_MONTHS, description="Quantidade de meses (mês atual incluído)"),
     current_user: dict = Depends(get_current_user)
 ):
     """Obter tendências de gastos dos últimos meses"""
     try:
         api = OrganizzeAPI(api_key=current_user["organizze_token"])
         
-        # Get transactions for the last N months
+        # Get transactions for the last N calendar months (current included),
+        # assembled from the per-month cache buckets
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=months * 30)
+        year, month = end_date.year, end_date.month
+        for _ in range(months - 1):
+            year, month = previous_month(year, month)
         
-        transactions_data = await api.get_transactions(
-            per_page=1000,
-            start_date=start_date.strftime('%Y-%m-%d'),
+        transactions = await api.get_transactions_table(
+            start_date=f"{year:04d}-{month:02d}-01",
             end_date=end_date.strftime('%Y-%m-%d')
         )
         
         # Group by month
-        monthly_data = {}
-        for transaction in transactions_data.get('transactions', []):
-            date = datetime.fromisoformat(transaction.get('date', '').replace('Z', '+00:00'))
-            month_key = date.strftime('%Y-%m')
-            amount = Decimal(str(transaction.get('amount', 0)))
-            
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {"income": 0, "expenses": 0}
-            
-            if amount > 0:
-                monthly_data[month_key]["income"] += float(amount)
-            else:
-                monthly_data[month_key]["expenses"] += float(abs(amount))
+        monthly_data = {
+            month_key: {"income": income / 100, "expenses": expenses / 100}
+            for month_key, (income, expenses) in transactions.totals_by_month().items()
+        }
         
         # Format for chart
         trend_data = [
@@ -127,10 +73,96 @@ async def get_spending_trends(
         
         return {"trends": trend_data}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating spending trends: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro ao gerar tendências de gastos")
 
+@router.get("/categories")
+async def get_category_breakdown(
+    depth: int = Query(1, ge=1, le=10, description="Níveis abaixo das raízes (ou de parent)"),
+    parent: Optional[int] = Query(None, description="Categoria a detalhar"),
+    start_date: Optional[str] = Query(None, description="Data inicial (YYYY-MM-DD), padrão: início do mês"),
+    end_date: Optional[str] = Query(None, description="Data final (YYYY-MM-DD), padrão: hoje"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Totais por categoria agregados na hierarquia (drill-down)"""
+    now = datetime.now()
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d') if start_date else now.replace(day=1)
+        end = datetime.strptime(end_date, '%Y-%m-%d') if end_date else now
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de data inválido. Use YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(status_code=400, detail="Data inicial maior que a final")
+    if months_in_range(start, end) > MAX_RANGE_MONTHS:
+        raise HTTPException(status_code=400, detail=f"Intervalo máximo de {MAX_RANGE_MONTHS} meses")
+    
+    try:
+        api = OrganizzeAPI(api_key=current_user["organizze_token"])
+        tree = await api.get_category_tree()
+        transactions = await api.get_transactions_table(
+            start_date=start.strftime('%Y-%m-%d'),
+            end_date=end.strftime('%Y-%m-%d')
+        )
+        
+        try:
+            categories = tree.rollup(transactions.totals_by_category(), depth=depth, parent=parent)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Categoria não encontrada")
+        
+        return {
+            "parent": tree.node(tree.slot(parent)) if parent is not None else None,
+            "depth": depth,
+            "start_date": start.strftime('%Y-%m-%d'),
+            "end_date": end.strftime('%Y-%m-%d'),
+            "categories": categories
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating category breakdown: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro ao gerar análise por categoria")
+
+@router.get("/budgets")
+async def get_budget_analysis(
+    month: Optional[str] = Query(None, description="Mês (YYYY-MM), padrão: mês atual"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Orçado vs. realizado por categoria, com projeção para o fim do mês"""
+    try:
+        target = datetime.strptime(month, '%Y-%m') if month else datetime.now()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de mês inválido. Use YYYY-MM")
+    
+    try:
+        api = OrganizzeAPI(api_key=current_user["organizze_token"])
+        
+        # Check cache first (dropped together with the month's transactions)
+        cache_key = api.month_result_key("budget_analysis", target.year, target.month)
+        cached_analysis = cache.get(cache_key)
+        if cached_analysis:
+            return cached_analysis
+        
+        budgets_data = await api.get_budgets(target.year, target.month)
+        tree = await api.get_category_tree()
+        transactions = await api.get_month_table(target.year, target.month)
+        
+        analysis = analyze_budgets(
+            budgets_data, tree, transactions.totals_by_category(), target.year, target.month
+        )
+        cache.set(cache_key, analysis, ttl=api.month_result_ttl(target.year, target.month))
+        
+        return analysis
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating budget analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro ao gerar análise de orçamento")
+
 @router.get("/goals")
 async def get_financial_goals(current_user: dict = Depends(get_current_user)):
     """Obter metas financeiras (simulado)"""
@@ -155,8 +187,3 @@ async def get_financial_goals(current_user: dict = Depends(get_current_user)):
     ]
     
     return {"goals": mock_goals}
-
-def _get_category_color(index: int) -> str:
-    """Get color for category by index"""
-    colors = ['#8884d8', '#82ca9d', '#ffc658', '#ff7300', '#8dd1e1', '#387908', '#ff6b6b']
-    return colors[index % len(colors)]
\ No newline at end of file
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from app.models.auth import TokenRequest, TokenResponse
 from app.core.security import create_access_token
 from app.services.organizze_api import OrganizzeAPI
+from app.services.cache_warmup import warmer
 from app.core.logging import get_logger
 import hashlib
 
@@ -15,7 +16,7 @@ async def login(request: TokenRequest):
         # Validate token by making a test request to Organizze
         api = OrganizzeAPI(api_key=request.token)
         
-        # Test the token by fetching accounts
+        # Test the token by fetching accounts (the response is cached for the dashboard)
         await api.get_accounts()
         
         # Generate user ID from token hash
@@ -29,6 +30,9 @@ async def login(request: TokenRequest):
         
         logger.info(f"User {user_id} logged in successfully")
         
+        # Prefetch the rest of the dashboard data in background
+        warmer.schedule(user_id, request.token)
+        
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
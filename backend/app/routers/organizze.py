@@ -1,12 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional
-from datetime import datetime
-from app.services.organizze_api import OrganizzeAPI
+from datetime import date, datetime
+from app.services.organizze_api import OrganizzeAPI, months_in_range, MAX_RANGE_MONTHS
 from app.core.security import get_current_user
+from app.core.admission import admission_control
 from app.core.logging import get_logger
 from app.models.financial import PaginatedResponse
+from app.services.transaction_search import get_search_index, invalidate_search_month
 
-router = APIRouter(tags=["Organizze"], dependencies=[Depends(get_current_user)])
+router = APIRouter(tags=["Organizze"], dependencies=[Depends(get_current_user), Depends(admission_control)])
 logger = get_logger(__name__)
 
 def get_organizze_api(current_user: dict = Depends(get_current_user)) -> OrganizzeAPI:
@@ -65,6 +67,63 @@ async def get_transactions(
         logger.error(f"Error fetching transactions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
+@router.get("/transactions/search")
+async def search_transactions(
+    q: str = Query("", max_length=200, description="Texto na descrição"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Valor absoluto mínimo"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Valor absoluto máximo"),
+    type: Optional[str] = Query(None, pattern="^(income|expense)$", description="income ou expense"),
+    account_id: Optional[int] = Query(None, description="Conta"),
+    category_id: Optional[int] = Query(None, description="Categoria"),
+    start_date: Optional[str] = Query(None, description="Data inicial (YYYY-MM-DD), padrão: 12 meses atrás"),
+    end_date: Optional[str] = Query(None, description="Data final (YYYY-MM-DD), padrão: hoje"),
+    page: int = Query(1, ge=1, description="Número da página"),
+    per_page: int = Query(50, ge=1, le=100, description="Itens por página"),
+    api: OrganizzeAPI = Depends(get_organizze_api)
+):
+    """Buscar transações por texto, valor, conta, categoria e período"""
+    today = date.today()
+    try:
+        end = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else today
+        start = (datetime.strptime(start_date, '%Y-%m-%d').date() if start_date
+                 else date(end.year - 1, end.month, 1))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de data inválido. Use YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(status_code=400, detail="Data inicial maior que a final")
+    if months_in_range(start, end) > MAX_RANGE_MONTHS:
+        raise HTTPException(status_code=400, detail=f"Intervalo máximo de {MAX_RANGE_MONTHS} meses")
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=400, detail="Valor mínimo maior que o máximo")
+    
+    try:
+        index = get_search_index(api)
+        return await index.search(
+            api, start, end, query=q, min_amount=min_amount, max_amount=max_amount, kind=type,
+            account_id=account_id, category_id=category_id, page=page, per_page=per_page
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching transactions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+@router.post("/transactions/refresh")
+async def refresh_transactions(
+    month: Optional[str] = Query(None, description="Mês a recarregar (YYYY-MM), padrão: mês atual"),
+    api: OrganizzeAPI = Depends(get_organizze_api)
+):
+    """Invalidar o cache de transações de um mês"""
+    try:
+        target = datetime.strptime(month, '%Y-%m') if month else datetime.now()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de mês inválido. Use YYYY-MM")
+    
+    invalidated = api.invalidate_month(target.year, target.month)
+    invalidate_search_month(api, target.year, target.month)
+    logger.info(f"Transactions cache refreshed for {target.strftime('%Y-%m')}")
+    return {"month": target.strftime('%Y-%m'), "invalidated": invalidated}
+
 @router.get("/categories")
 async def get_categories(api: OrganizzeAPI = Depends(get_organizze_api)):
     """Buscar categorias do Organizze"""
@@ -0,0 +1,52 @@
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.core.security import get_current_user, get_current_user_sse, create_stream_token, STREAM_TOKEN_EXPIRE_SECONDS
+from app.core.logging import get_logger
+from app.services.live_updates import broadcaster, TooManyStreams, STREAM_HEARTBEAT_INTERVAL
+
+router = APIRouter(tags=["Tempo real"])
+logger = get_logger(__name__)
+
+STREAM_RETRY_MS = 5000  # client reconnect delay
+
+@router.post("/token")
+async def issue_stream_token(current_user: dict = Depends(get_current_user)):
+    """Emitir token de curta duração para abrir o stream via EventSource (?token=)"""
+    return {"token": create_stream_token(current_user), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
+@router.get("/summary")
+async def stream_summary(request: Request, current_user: dict = Depends(get_current_user_sse)):
+    """Stream SSE com o resumo financeiro sempre que ele mudar"""
+    user_id = current_user["id"]
+    try:
+        queue = broadcaster.subscribe(user_id, current_user["organizze_token"])
+    except TooManyStreams:
+        raise HTTPException(
+            status_code=429,
+            detail="Limite de conexões em tempo real atingido",
+            headers={"Retry-After": "30"}
+        )
+    logger.info(f"Summary stream opened for user {user_id} ({broadcaster.connections(user_id)} open)")
+
+    async def events():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Heartbeat keeps proxies from closing the idle connection
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {event['hash']}\nevent: summary\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            broadcaster.unsubscribe(user_id, queue)
+            logger.info(f"Summary stream closed for user {user_id}")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
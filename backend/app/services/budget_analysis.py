@@ -0,0 +1,92 @@
+import calendar
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.category_tree import CategoryTree
+
+def _budget_items(budgets_data: Any) -> List[Dict[str, Any]]:
+    """Aceita a resposta do /budgets como lista ou como {"budgets": [...]}"""
+    if isinstance(budgets_data, dict):
+        return budgets_data.get('budgets', [])
+    return budgets_data or []
+
+def _budget_cents(budget: Dict[str, Any]) -> int:
+    if budget.get('amount_in_cents') is not None:
+        return int(budget['amount_in_cents'])
+    return round(float(budget.get('amount', 0) or 0) * 100)
+
+def _budgeted_parents(tree: CategoryTree, category_slot: Optional[int]) -> List[int]:
+    if category_slot is None:
+        return []
+    return [tree.ids[s] for s in tree.ancestors[category_slot][:-1]]
+
+def analyze_budgets(budgets_data: Any, tree: CategoryTree,
+                    totals: Dict[Optional[int], Tuple[int, int]],
+                    year: int, month: int, today: Optional[date] = None) -> Dict[str, Any]:
+    """Orçado vs. realizado por categoria em um mês.
+
+    ``totals`` são os totais (receitas, despesas) por categoria do mês, em
+    centavos. O gasto de uma subcategoria também consome o orçamento das
+    categorias ancestrais orçadas.
+    """
+    today = today or date.today()
+    days_in_month = calendar.monthrange(year, month)[1]
+    if (today.year, today.month) == (year, month):
+        elapsed_days = today.day
+    elif (today.year, today.month) > (year, month):
+        elapsed_days = days_in_month
+    else:
+        elapsed_days = 0
+
+    # Hash index: category_id -> budget slot (entries dated in another month are ignored)
+    month_prefix = f"{year:04d}-{month:02d}"
+    budgets = [
+        b for b in _budget_items(budgets_data)
+        if b.get('category_id') is not None and str(b.get('date') or month_prefix).startswith(month_prefix)
+    ]
+    slot_of = {b['category_id']: i for i, b in enumerate(budgets)}
+    spent = [0] * len(budgets)
+
+    for category_id, (_, expenses) in totals.items():
+        if not expenses:
+            continue
+        category_slot = tree.slot(category_id)
+        chain = [tree.ids[s] for s in tree.ancestors[category_slot]] if category_slot is not None else [category_id]
+        for ancestor_id in chain:
+            budget_slot = slot_of.get(ancestor_id)
+            if budget_slot is not None:
+                spent[budget_slot] += expenses
+
+    items = []
+    total_budget = total_spent = total_projected = 0
+    for budget, spent_cents in zip(budgets, spent):
+        budget_cents = _budget_cents(budget)
+        projected = round(spent_cents * days_in_month / elapsed_days) if elapsed_days else 0
+        category_slot = tree.slot(budget['category_id'])
+
+        items.append({
+            "category_id": budget['category_id'],
+            "name": tree.names[category_slot] if category_slot is not None else 'Outros',
+            "budget": budget_cents / 100,
+            "spent": spent_cents / 100,
+            "remaining": (budget_cents - spent_cents) / 100,
+            "used_percentage": round(spent_cents / budget_cents * 100, 2) if budget_cents else None,
+            "projected": projected / 100,
+            "projected_overrun": max(projected - budget_cents, 0) / 100,
+        })
+        # Ancestors already include their children's spending: count top-level budgets only
+        if not any(slot_of.get(a) is not None for a in _budgeted_parents(tree, category_slot)):
+            total_budget += budget_cents
+            total_spent += spent_cents
+            total_projected += projected
+
+    items.sort(key=lambda item: item["projected_overrun"], reverse=True)
+    return {
+        "month": f"{year:04d}-{month:02d}",
+        "elapsed_days": elapsed_days,
+        "days_in_month": days_in_month,
+        "total_budget": total_budget / 100,
+        "total_spent": total_spent / 100,
+        "total_remaining": (total_budget - total_spent) / 100,
+        "total_projected": total_projected / 100,
+        "budgets": items,
+    }
@@ -0,0 +1,88 @@
+import os
+import asyncio
+import contextvars
+from datetime import datetime
+from typing import Dict
+from app.services.organizze_api import OrganizzeAPI, previous_month
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Warm-up configuration
+WARMUP_ENABLED = os.getenv("CACHE_WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", "4"))  # users warmed at once
+WARMUP_TIMEOUT = float(os.getenv("CACHE_WARMUP_TIMEOUT", "30"))  # seconds per user
+
+class CacheWarmer:
+    """Pré-carrega no cache os dados do dashboard logo após o login"""
+
+    def __init__(self, max_concurrency: int = WARMUP_CONCURRENCY, timeout: float = WARMUP_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore = None
+
+    def schedule(self, user_id: str, api_key: str) -> bool:
+        """Agendar warm-up do usuário; ignora se já houver um em andamento"""
+        if not WARMUP_ENABLED:
+            return False
+
+        running = self._tasks.get(user_id)
+        if running and not running.done():
+            logger.info(f"Cache warm-up already running for user {user_id}")
+            return False
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Empty context so the login request's state (e.g. profiling spans) is not inherited
+        task = contextvars.Context().run(
+            asyncio.create_task, self._warm(user_id, api_key), name=f"cache-warmup:{user_id}"
+        )
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda t: self._forget(user_id, t))
+        return True
+
+    def _forget(self, user_id: str, task: asyncio.Task):
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+
+    async def _warm(self, user_id: str, api_key: str):
+        api = OrganizzeAPI(api_key=api_key)
+        now = datetime.now()
+        prev_year, prev_month = previous_month(now.year, now.month)
+
+        async with self._semaphore:
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        api.get_categories(),
+                        api.get_budgets(),
+                        api.get_month_table(now.year, now.month),
+                        api.get_month_table(prev_year, prev_month),
+                        return_exceptions=True
+                    ),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Cache warm-up timed out for user {user_id}")
+                return
+
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if failed:
+            logger.warning(f"Cache warm-up for user {user_id} finished with {len(failed)} errors")
+        else:
+            logger.info(f"Cache warm-up completed for user {user_id}")
+
+    async def shutdown(self):
+        """Cancelar warm-ups pendentes"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"Cancelled {len(tasks)} pending cache warm-ups")
+        self._tasks.clear()
+
+# Global warmer instance
+warmer = CacheWarmer()
@@ -0,0 +1,51 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict
+from app.services.organizze_api import OrganizzeAPI
+
+SUMMARY_CACHE_TTL = 1800  # 30 minutes
+
+async def build_financial_summary(api: OrganizzeAPI) -> Dict[str, Any]:
+    """Calcular o resumo financeiro do mês atual"""
+    # Fetch data from API
+    now = datetime.now()
+    accounts_data = await api.get_accounts()
+    transactions = await api.get_month_table(now.year, now.month)
+    categories_data = await api.get_categories()
+    
+    # Calculate summary
+    total_balance = sum(
+        Decimal(str(account.get('balance', 0))) 
+        for account in accounts_data.get('accounts', [])
+    )
+    
+    # Current month totals (cents)
+    income_cents, expenses_cents = transactions.totals()
+    monthly_income = Decimal(income_cents) / 100
+    monthly_expenses = Decimal(expenses_cents) / 100
+    
+    # Category summary
+    category_names = {cat['id']: cat['name'] for cat in categories_data.get('categories', [])}
+    category_totals = {}
+    for category_id, cents in transactions.sum_by_category().items():
+        if category_id and cents > 0:
+            category_name = category_names.get(category_id, 'Outros')
+            category_totals[category_name] = category_totals.get(category_name, 0) + cents / 100
+    
+    summary = {
+        "total_balance": float(total_balance),
+        "monthly_income": float(monthly_income),
+        "monthly_expenses": float(monthly_expenses),
+        "net_income": float(monthly_income - monthly_expenses),
+        "budget_used": min(100, (float(monthly_expenses) / max(float(monthly_income), 1)) * 100),
+        "categories_summary": [
+            {"name": name, "value": value, "color": _get_category_color(i)}
+            for i, (name, value) in enumerate(sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:5])
+        ]
+    }
+    return summary
+
+def _get_category_color(index: int) -> str:
+    """Get color for category by index"""
+    colors = ['#8884d8', '#82ca9d', '#ffc658', '#ff7300', '#8dd1e1', '#387908', '#ff6b6b']
+    return colors[index % len(colors)]
@@ -0,0 +1,126 @@
+import os
+import json
+import asyncio
+import hashlib
+import contextvars
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.cache import cache
+from app.core.logging import get_logger
+from app.services.organizze_api import OrganizzeAPI
+from app.services.financial_summary import build_financial_summary, SUMMARY_CACHE_TTL
+
+logger = get_logger(__name__)
+
+# Live updates configuration
+STREAM_REFRESH_INTERVAL = float(os.getenv("STREAM_REFRESH_INTERVAL", "60"))  # seconds between upstream refreshes
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))  # seconds
+STREAM_MAX_CONNECTIONS_PER_USER = int(os.getenv("STREAM_MAX_CONNECTIONS_PER_USER", "3"))
+
+class TooManyStreams(Exception):
+    pass
+
+def content_hash(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+class SummaryBroadcaster:
+    """Atualiza o resumo em background e avisa os streams SSE do usuário.
+
+    Enquanto houver ao menos um stream aberto, uma tarefa por usuário
+    recarrega os dados do Organizze a cada ``refresh_interval`` e só publica
+    quando o hash do resumo muda.
+    """
+
+    def __init__(self, refresh_interval: float = STREAM_REFRESH_INTERVAL,
+                 max_per_user: int = STREAM_MAX_CONNECTIONS_PER_USER):
+        self.refresh_interval = refresh_interval
+        self.max_per_user = max_per_user
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._refreshers: Dict[str, asyncio.Task] = {}
+        self._latest: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+    def subscribe(self, user_id: str, api_key: str) -> asyncio.Queue:
+        """Registrar um stream; levanta TooManyStreams acima do limite"""
+        queues = self._subscribers.setdefault(user_id, set())
+        if len(queues) >= self.max_per_user:
+            raise TooManyStreams(user_id)
+
+        # Only the newest event matters: a slow client skips intermediate ones
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        queues.add(queue)
+        if user_id in self._latest:
+            queue.put_nowait(self._event(*self._latest[user_id], changed=None))
+
+        if user_id not in self._refreshers:
+            # Empty context: the refresher outlives the request and must not
+            # inherit its request-scoped state (e.g. profiling spans)
+            self._refreshers[user_id] = contextvars.Context().run(
+                asyncio.create_task, self._refresh_loop(user_id, api_key), name=f"summary-refresh:{user_id}"
+            )
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+            self._latest.pop(user_id, None)
+            task = self._refreshers.pop(user_id, None)
+            if task:
+                task.cancel()
+
+    def connections(self, user_id: str) -> int:
+        return len(self._subscribers.get(user_id, ()))
+
+    def _event(self, digest: str, summary: Dict[str, Any], changed: Optional[List[str]]) -> Dict[str, Any]:
+        return {"hash": digest, "changed": changed, "summary": summary}
+
+    def _publish(self, user_id: str, event: Dict[str, Any]):
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _refresh_loop(self, user_id: str, api_key: str):
+        api = OrganizzeAPI(api_key=api_key)
+        first = True
+        while True:
+            try:
+                if not first:
+                    # Drop what can change between refreshes so it is refetched
+                    now = datetime.now()
+                    api.invalidate("/accounts")
+                    api.invalidate_month(now.year, now.month)
+                summary = await build_financial_summary(api)
+                cache.set(cache.get_cache_key("summary", user_id), summary, ttl=SUMMARY_CACHE_TTL)
+
+                digest = content_hash(summary)
+                previous = self._latest.get(user_id)
+                if previous is None or previous[0] != digest:
+                    changed = None
+                    if previous is not None:
+                        changed = sorted(k for k in summary if summary.get(k) != previous[1].get(k))
+                    self._latest[user_id] = (digest, summary)
+                    self._publish(user_id, self._event(digest, summary, changed))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing summary for user {user_id}: {str(e)}")
+            first = False
+            await asyncio.sleep(self.refresh_interval)
+
+    async def shutdown(self):
+        """Cancelar as tarefas de atualização"""
+        tasks = list(self._refreshers.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshers.clear()
+        self._subscribers.clear()
+        self._latest.clear()
+
+# Global broadcaster instance
+broadcaster = SummaryBroadcaster()
@@ -1,18 +1,81 @@
 import os
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+import calendar
 import httpx
-from typing import Optional, Dict, Any
+from datetime import date, timedelta
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import HTTPException
 from app.core.cache import cache
 from app.core.logging import get_logger
+from app.core.profiling import record_span
+from app.models.transaction_table import TransactionTable
+from app.models.category_tree import CategoryTree
 
 logger = get_logger(__name__)
 
+def month_range(year: int, month: int) -> Tuple[str, str]:
+    """Primeiro e último dia do mês no formato YYYY-MM-DD"""
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1).isoformat(), date(year, month, last_day).isoformat()
+
+def previous_month(year: int, month: int) -> Tuple[int, int]:
+    """Ano e mês anteriores ao informado"""
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+def iter_months(start: date, end: date) -> List[Tuple[int, int]]:
+    """Meses do calendário (ano, mês) que cobrem o intervalo"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def months_in_range(start: date, end: date) -> int:
+    """Quantidade de meses do calendário tocados pelo intervalo (inclusivo)"""
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+ORGANIZZE_API_URL = os.getenv("ORGANIZZE_API_URL", "https://api.organizze.com.br")
+UPSTREAM_CACHE_TTL = 1800  # 30 minutes
+# Month buckets: closed months rarely change, the current one does
+CLOSED_MONTH_TTL = int(os.getenv("CLOSED_MONTH_TTL", str(90 * 24 * 3600)))  # 90 days
+CURRENT_MONTH_TTL = int(os.getenv("CURRENT_MONTH_TTL", "300"))  # 5 minutes
+# Days after month end during which late edits are still expected
+CLOSED_MONTH_GRACE_DAYS = int(os.getenv("CLOSED_MONTH_GRACE_DAYS", "3"))
+MONTH_PAGE_SIZE = 500
+MONTH_MAX_PAGES = 100
+MAX_RANGE_MONTHS = int(os.getenv("MAX_RANGE_MONTHS", "24"))  # calendar months per range query
+MONTH_FETCH_CONCURRENCY = int(os.getenv("MONTH_FETCH_CONCURRENCY", "4"))  # month buckets fetched at once per request
+CATEGORY_TREE_CACHE_SIZE = 256
+# Results computed from a month bucket, dropped together with it
+DERIVED_MONTH_RESULTS = ("budget_analysis",)
+
+# Built category trees per user: cache_scope -> (expires_at, tree)
+_category_trees: "OrderedDict[str, Tuple[float, CategoryTree]]" = OrderedDict()
+# Month buckets being fetched: cache key -> future shared by concurrent callers
+_month_fetches: Dict[str, "asyncio.Future[TransactionTable]"] = {}
+
+def _forget_month_fetch(cache_key: str, future: "asyncio.Future[TransactionTable]"):
+    if _month_fetches.get(cache_key) is future:
+        del _month_fetches[cache_key]
+    if not future.cancelled():
+        future.exception()  # retrieved here in case every caller went away
+
 class OrganizzeAPI:
+    # Optional httpx transport override (e.g. an in-process ASGI stand-in)
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    
     def __init__(self, api_key: Optional[str] = None):
-        self.base_url = "https://api.organizze.com.br"
+        self.base_url = ORGANIZZE_API_URL
         self.api_key = api_key or os.getenv("ORGANIZZE_API_KEY")
         if not self.api_key:
             raise ValueError("ORGANIZZE_API_KEY environment variable is required")
+        # Same derivation as the user id in the JWT, so cached responses are
+        # scoped per user instead of shared across tokens.
+        self.cache_scope = hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
     
     def _get_headers(self) -> Dict[str, str]:
         return {
@@ -21,21 +84,24 @@ class OrganizzeAPI:
             "User-Agent": "Financial-Insights/1.0"
         }
     
-    async def _make_request(self, endpoint: str, method: str = "GET", **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling and logging"""
+    async def _make_request(self, endpoint: str, method: str = "GET",
+                            cache_ttl: int = UPSTREAM_CACHE_TTL, **kwargs) -> Dict[str, Any]:
+        """Make HTTP request with error handling and logging (cache_ttl=0 skips the cache)"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        started = time.perf_counter()
         
         # Check cache first for GET requests
         cache_key = None
-        if method == "GET":
-            cache_key = cache.get_cache_key("organizze", endpoint, str(kwargs.get('params', {})))
+        if method == "GET" and cache_ttl:
+            cache_key = cache.get_cache_key("organizze", self.cache_scope, endpoint, str(kwargs.get('params', {})))
             cached_data = cache.get(cache_key)
             if cached_data:
                 logger.info(f"Cache hit for {endpoint}")
+                record_span(endpoint, started, 200, cache_hit=True)
                 return cached_data
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self.transport) as client:
                 logger.info(f"Making API request to {endpoint}")
                 response = await client.request(
                     method=method,
@@ -43,6 +109,7 @@ class OrganizzeAPI:
                     headers=self._get_headers(),
                     **kwargs
                 )
+                record_span(endpoint, started, response.status_code, params=kwargs.get('params'))
                 
                 if response.status_code == 401:
                     logger.error("Unauthorized access to Organizze API")
@@ -67,23 +134,27 @@ class OrganizzeAPI:
                 
                 # Cache successful GET responses
                 if method == "GET" and cache_key:
-                    cache.set(cache_key, data, ttl=1800)  # 30 minutes
+                    cache.set(cache_key, data, ttl=cache_ttl)
                 
                 logger.info(f"Successfully fetched data from {endpoint}")
                 return data
                 
         except httpx.TimeoutException:
             logger.error(f"Timeout on request to {endpoint}")
+            record_span(endpoint, started, "timeout")
             raise HTTPException(
                 status_code=504,
                 detail="Timeout na comunicação com a API do Organizze"
             )
         except httpx.NetworkError as e:
             logger.error(f"Network error on request to {endpoint}: {str(e)}")
+            record_span(endpoint, started, "network_error")
             raise HTTPException(
                 status_code=503,
                 detail="Erro de conexão com a API do Organizze"
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error on request to {endpoint}: {str(e)}")
             raise HTTPException(
@@ -108,12 +179,131 @@ class OrganizzeAPI:
             
         return await self._make_request("/transactions", params=params)
     
+    def _month_cache_key(self, year: int, month: int) -> str:
+        return cache.get_cache_key("organizze", self.cache_scope, "transactions_columns", f"{year:04d}-{month:02d}")
+    
+    def _is_closed_month(self, year: int, month: int) -> bool:
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        return last_day + timedelta(days=CLOSED_MONTH_GRACE_DAYS) < date.today()
+    
+    async def get_month_table(self, year: int, month: int) -> TransactionTable:
+        """Buscar todas as transações de um mês do calendário.
+        
+        Cada mês é um bucket de cache em formato colunar: meses fechados são
+        tratados como imutáveis (TTL longo, só mudam via ``invalidate_month``)
+        e o mês corrente expira rápido. Chamadas simultâneas para o mesmo
+        bucket (ex.: warm-up e primeiras requisições do dashboard) compartilham
+        uma única busca.
+        """
+        cache_key = self._month_cache_key(year, month)
+        started = time.perf_counter()
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            record_span(f"/transactions[{year:04d}-{month:02d}]", started, 200, cache_hit=True)
+            return TransactionTable.from_columns(cached_data)
+        
+        pending = _month_fetches.get(cache_key)
+        if pending is None:
+            pending = _month_fetches[cache_key] = asyncio.ensure_future(
+                self._fetch_month_table(year, month, cache_key)
+            )
+            pending.add_done_callback(lambda f: _forget_month_fetch(cache_key, f))
+        # Shielded so one caller going away does not cancel the fetch for the others
+        return await asyncio.shield(pending)
+    
+    async def _fetch_month_table(self, year: int, month: int, cache_key: str) -> TransactionTable:
+        start_date, end_date = month_range(year, month)
+        table = TransactionTable()
+        for page in range(1, MONTH_MAX_PAGES + 1):
+            data = await self._make_request(
+                "/transactions",
+                cache_ttl=0,
+                params={"page": page, "per_page": MONTH_PAGE_SIZE, "start_date": start_date, "end_date": end_date}
+            )
+            batch = data.get('transactions', [])
+            table.extend(batch)
+            if len(batch) < MONTH_PAGE_SIZE:
+                break
+        else:
+            logger.warning(f"Month {year:04d}-{month:02d} truncated at {MONTH_MAX_PAGES} pages")
+        
+        ttl = CLOSED_MONTH_TTL if self._is_closed_month(year, month) else CURRENT_MONTH_TTL
+        cache.set(cache_key, table.to_columns(), ttl=ttl)
+        return table
+    
+    async def get_transactions_table(self, start_date: str, end_date: str) -> TransactionTable:
+        """Buscar transações de um intervalo montando-as a partir dos buckets mensais.
+        
+        O intervalo é limitado a ``MAX_RANGE_MONTHS`` meses (400 acima disso) e
+        no máximo ``MONTH_FETCH_CONCURRENCY`` buckets são buscados ao mesmo tempo.
+        """
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        if months_in_range(start, end) > MAX_RANGE_MONTHS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Intervalo máximo de {MAX_RANGE_MONTHS} meses"
+            )
+        months = [m for m in iter_months(start, end) if date(m[0], m[1], 1) <= date.today()]
+        
+        semaphore = asyncio.Semaphore(MONTH_FETCH_CONCURRENCY)
+        async def fetch(year: int, month: int) -> TransactionTable:
+            async with semaphore:
+                return await self.get_month_table(year, month)
+        tables = await asyncio.gather(*(fetch(y, m) for y, m in months))
+        
+        result = TransactionTable()
+        for (year, month), table in zip(months, tables):
+            first_day, last_day = month_range(year, month)
+            if start_date > first_day or last_day > end_date:
+                table = table.filter(start=start, end=end)
+            result.concat(table)
+        return result
+    
+    def invalidate(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Descartar a resposta em cache de um GET"""
+        return cache.delete(cache.get_cache_key("organizze", self.cache_scope, endpoint, str(params or {})))
+    
+    def month_result_key(self, name: str, year: int, month: int) -> str:
+        """Chave de cache de um resultado derivado das transações do mês"""
+        return cache.get_cache_key(name, self.cache_scope, f"{year:04d}-{month:02d}")
+    
+    def month_result_ttl(self, year: int, month: int) -> int:
+        """TTL de resultados derivados: nunca maior que o do bucket do mês"""
+        return UPSTREAM_CACHE_TTL if self._is_closed_month(year, month) else CURRENT_MONTH_TTL
+    
+    def invalidate_month(self, year: int, month: int) -> bool:
+        """Descartar o bucket de um mês (ex.: transação antiga editada) e os resultados derivados"""
+        for name in DERIVED_MONTH_RESULTS:
+            cache.delete(self.month_result_key(name, year, month))
+        today = date.today()
+        if (year, month) == (today.year, today.month):
+            cache.delete(cache.get_cache_key("summary", self.cache_scope))
+        # Callers arriving after this must not join a fetch that may predate the edit
+        _month_fetches.pop(self._month_cache_key(year, month), None)
+        return cache.delete(self._month_cache_key(year, month))
+    
     async def get_categories(self) -> Dict[str, Any]:
         """Buscar categorias do Organizze"""
         return await self._make_request("/categories")
     
-    async def get_budgets(self) -> Dict[str, Any]:
-        """Buscar orçamentos do Organizze"""
+    async def get_category_tree(self) -> CategoryTree:
+        """Índice da árvore de categorias do usuário (construído uma vez por TTL)"""
+        entry = _category_trees.get(self.cache_scope)
+        if entry and entry[0] > time.monotonic():
+            _category_trees.move_to_end(self.cache_scope)
+            return entry[1]
+        
+        tree = CategoryTree((await self.get_categories()).get('categories', []))
+        _category_trees[self.cache_scope] = (time.monotonic() + UPSTREAM_CACHE_TTL, tree)
+        _category_trees.move_to_end(self.cache_scope)
+        while len(_category_trees) > CATEGORY_TREE_CACHE_SIZE:
+            _category_trees.popitem(last=False)
+        return tree
+    
+    async def get_budgets(self, year: Optional[int] = None, month: Optional[int] = None) -> Dict[str, Any]:
+        """Buscar orçamentos do Organizze (do mês atual, ou de ``year``/``month``)"""
+        if year is not None and month is not None:
+            return await self._make_request(f"/budgets/{year:04d}/{month:02d}")
         return await self._make_request("/budgets")
     
     async def health_check(self) -> bool:
@@ -0,0 +1,214 @@
+import re
+import time
+import asyncio
+import hashlib
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.transaction_table import TransactionTable, EPOCH_ORDINAL
+from fastapi import HTTPException
+from app.services.organizze_api import (
+    OrganizzeAPI, iter_months, months_in_range, MAX_RANGE_MONTHS, MONTH_FETCH_CONCURRENCY
+)
+
+SEARCH_INDEX_CACHE_SIZE = 128  # users kept in memory
+SEARCH_SEGMENTS_PER_USER = MAX_RANGE_MONTHS  # month segments kept per user (LRU), enough for the widest search
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Tokens em minúsculas e sem acentos"""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    return _TOKEN_RE.findall("".join(c for c in normalized if not unicodedata.combining(c)))
+
+class MonthSegment:
+    """Índices de busca das transações de um mês.
+
+    - tokens -> ids de descrição (as descrições já são internadas na tabela),
+      com os tokens ordenados para busca por prefixo via bisect
+    - id de descrição -> linhas
+    - linhas ordenadas por valor absoluto e por data, para busca por faixa
+    """
+
+    def __init__(self, table: TransactionTable):
+        self.table = table
+        self.fingerprint = self.fingerprint_of(table)
+        self.checked_at = time.monotonic()
+
+        self.rows_by_description: Dict[int, List[int]] = {}
+        for row, description_id in enumerate(table.description_ids):
+            self.rows_by_description.setdefault(description_id, []).append(row)
+
+        self.postings: Dict[str, set] = {}
+        for description_id in self.rows_by_description:
+            for token in tokenize(table.descriptions[description_id]):
+                self.postings.setdefault(token, set()).add(description_id)
+        self.tokens: List[str] = sorted(self.postings)
+
+        rows = range(len(table))
+        self.by_amount = array("l", sorted(rows, key=lambda r: abs(table.cents[r])))
+        self.amount_keys = array("q", (abs(table.cents[r]) for r in self.by_amount))
+        self.by_day = array("l", sorted(rows, key=lambda r: table.days[r]))
+        self.day_keys = array("l", (table.days[r] for r in self.by_day))
+
+    @staticmethod
+    def fingerprint_of(table: TransactionTable) -> str:
+        """Hash de todas as colunas: qualquer edição (descrição, categoria, conta, data...) muda o valor"""
+        digest = hashlib.blake2b(digest_size=16)
+        for column in (table.ids, table.cents, table.account_ids, table.category_ids,
+                       table.days, table.description_ids, table.paid):
+            digest.update(column.tobytes())
+        for description in table.descriptions:
+            digest.update(description.encode('utf-8'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _description_ids(self, token: str) -> set:
+        # Prefix match so partial words ("merc") find "mercado": prefixed
+        # tokens are contiguous in the sorted token list
+        matches = set()
+        tokens = self.tokens
+        i = bisect_left(tokens, token)
+        while i < len(tokens) and tokens[i].startswith(token):
+            matches |= self.postings[tokens[i]]
+            i += 1
+        return matches
+
+    def search(self, tokens: List[str], min_cents: Optional[int], max_cents: Optional[int],
+               first_day: Optional[int], last_day: Optional[int], kind: Optional[str],
+               account_id: Optional[int], category_id: Optional[int]) -> List[int]:
+        table = self.table
+
+        # Pick the most selective index to produce candidates
+        if tokens:
+            description_ids = None
+            for token in tokens:
+                ids = self._description_ids(token)
+                description_ids = ids if description_ids is None else description_ids & ids
+                if not description_ids:
+                    return []
+            candidates = [r for d in description_ids for r in self.rows_by_description[d]]
+        elif min_cents is not None or max_cents is not None:
+            lo = bisect_left(self.amount_keys, min_cents) if min_cents is not None else 0
+            hi = bisect_right(self.amount_keys, max_cents) if max_cents is not None else len(self.amount_keys)
+            candidates = self.by_amount[lo:hi]
+        else:
+            lo = bisect_left(self.day_keys, first_day) if first_day is not None else 0
+            hi = bisect_right(self.day_keys, last_day) if last_day is not None else len(self.day_keys)
+            candidates = self.by_day[lo:hi]
+
+        cents, days = table.cents, table.days
+        return [
+            r for r in candidates
+            if (min_cents is None or abs(cents[r]) >= min_cents)
+            and (max_cents is None or abs(cents[r]) <= max_cents)
+            and (first_day is None or days[r] >= first_day)
+            and (last_day is None or days[r] <= last_day)
+            and (kind is None or (cents[r] > 0) == (kind == "income"))
+            and (account_id is None or table.account_ids[r] == account_id)
+            and (category_id is None or table.category_ids[r] == category_id)
+        ]
+
+class TransactionSearchIndex:
+    """Índice de busca de um usuário, segmentado por mês.
+
+    Segmentos são reconstruídos só quando o bucket do mês muda, de modo que
+    uma sincronização do mês corrente não reindexa o histórico. Só os
+    ``SEARCH_SEGMENTS_PER_USER`` meses usados mais recentemente ficam em memória.
+    """
+
+    def __init__(self):
+        self.segments: "OrderedDict[Tuple[int, int], MonthSegment]" = OrderedDict()
+
+    async def segment(self, api: OrganizzeAPI, year: int, month: int) -> MonthSegment:
+        key = (year, month)
+        segment = self.segments.get(key)
+        if segment and time.monotonic() - segment.checked_at < api.month_result_ttl(year, month):
+            self.segments.move_to_end(key)
+            return segment
+
+        table = await api.get_month_table(year, month)
+        if segment and segment.fingerprint == MonthSegment.fingerprint_of(table):
+            segment.checked_at = time.monotonic()
+        else:
+            segment = MonthSegment(table)
+        self.segments[key] = segment
+        self.segments.move_to_end(key)
+        while len(self.segments) > SEARCH_SEGMENTS_PER_USER:
+            self.segments.popitem(last=False)
+        return segment
+
+    def invalidate_month(self, year: int, month: int):
+        self.segments.pop((year, month), None)
+
+    async def search(self, api: OrganizzeAPI, start: date, end: date, query: str = "",
+                     min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                     kind: Optional[str] = None, account_id: Optional[int] = None,
+                     category_id: Optional[int] = None, page: int = 1, per_page: int = 50) -> Dict[str, Any]:
+        tokens = tokenize(query)
+        min_cents = round(min_amount * 100) if min_amount is not None else None
+        max_cents = round(max_amount * 100) if max_amount is not None else None
+        first_day = start.toordinal() - EPOCH_ORDINAL
+        last_day = end.toordinal() - EPOCH_ORDINAL
+
+        if months_in_range(start, end) > MAX_RANGE_MONTHS:
+            raise HTTPException(status_code=400, detail=f"Intervalo máximo de {MAX_RANGE_MONTHS} meses")
+
+        # Newest months first: results are ordered by date, most recent first
+        months = [m for m in iter_months(start, end) if date(m[0], m[1], 1) <= date.today()][::-1]
+        matches: List[Tuple[MonthSegment, List[int]]] = []
+        total = 0
+        semaphore = asyncio.Semaphore(MONTH_FETCH_CONCURRENCY)
+
+        async def fetch(year: int, month: int) -> MonthSegment:
+            async with semaphore:
+                return await self.segment(api, year, month)
+        segments = await asyncio.gather(*(fetch(year, month) for year, month in months))
+        for segment in segments:
+            rows = segment.search(tokens, min_cents, max_cents, first_day, last_day, kind,
+                                  account_id, category_id)
+            if rows:
+                days, ids = segment.table.days, segment.table.ids
+                rows.sort(key=lambda r: (days[r], ids[r]), reverse=True)
+                matches.append((segment, rows))
+                total += len(rows)
+
+        offset = (page - 1) * per_page
+        items = []
+        for segment, rows in matches:
+            if offset >= len(rows):
+                offset -= len(rows)
+                continue
+            for r in rows[offset:offset + per_page - len(items)]:
+                items.append(segment.table.to_dict(r))
+            offset = 0
+            if len(items) >= per_page:
+                break
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": (total + per_page - 1) // per_page,
+        }
+
+# Per-user indexes: cache_scope -> index (LRU)
+_indexes: "OrderedDict[str, TransactionSearchIndex]" = OrderedDict()
+
+def get_search_index(api: OrganizzeAPI) -> TransactionSearchIndex:
+    index = _indexes.get(api.cache_scope)
+    if index is None:
+        index = _indexes[api.cache_scope] = TransactionSearchIndex()
+    _indexes.move_to_end(api.cache_scope)
+    while len(_indexes) > SEARCH_INDEX_CACHE_SIZE:
+        _indexes.popitem(last=False)
+    return index
+
+def invalidate_search_month(api: OrganizzeAPI, year: int, month: int):
+    """Descartar o segmento de um mês no índice do usuário"""
+    index = _indexes.get(api.cache_scope)
+    if index is not None:
+        index.invalidate_month(year, month)
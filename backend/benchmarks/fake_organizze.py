@@ -0,0 +1,185 @@
+"""Local stand-in for the Organizze API used by the benchmark suite.
+
+The dataset is generated deterministically and kept in typed arrays sorted by
+date, so even 1M transactions fit in a few tens of MB; dicts are only built
+for the page actually served.
+
+Serve it standalone with:
+
+    python -m benchmarks.fake_organizze --transactions 100000 --port 9000
+
+and point the app at it with ORGANIZZE_API_URL=http://localhost:9000.
+"""
+import argparse
+import asyncio
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+DESCRIPTIONS = [
+    "Supermercado", "Restaurante", "Uber", "Farmácia", "Aluguel", "Salário",
+    "Netflix", "Posto de gasolina", "Padaria", "Academia", "Conta de luz",
+    "Internet", "Transferência", "Cinema", "Livraria", "Pet shop",
+]
+
+@dataclass
+class FakeConfig:
+    transactions: int = 10_000
+    accounts: int = 5
+    categories: int = 30
+    days: int = 730
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 42
+
+class FakeDataset:
+    """Transações sintéticas em arrays ordenados por data"""
+
+    def __init__(self, config: FakeConfig):
+        rng = random.Random(config.seed)
+        n = config.transactions
+        self.end_day = date.today().toordinal()
+        start_day = self.end_day - config.days + 1
+
+        days = sorted(rng.randint(start_day, self.end_day) for _ in range(n))
+        self.days = array("l", days)
+        self.cents = array("q", (
+            rng.randint(100_000, 1_500_000) if rng.random() < 0.1 else -rng.randint(500, 50_000)
+            for _ in range(n)
+        ))
+        self.accounts = array("l", (rng.randint(1, config.accounts) for _ in range(n)))
+        self.categories = array("l", (rng.randint(1, config.categories) for _ in range(n)))
+        self.descriptions = array("H", (rng.randrange(len(DESCRIPTIONS)) for _ in range(n)))
+
+        self.account_list = [
+            {"id": i, "name": f"Conta {i}", "description": None, "type": "checking",
+             "balance": round(rng.uniform(-1000, 20000), 2)}
+            for i in range(1, config.accounts + 1)
+        ]
+        self.category_list = [
+            {"id": i, "name": f"Categoria {i}", "color": "#%06x" % rng.randrange(0xFFFFFF),
+             "parent_id": None if i <= 8 else rng.randint(1, 8)}
+            for i in range(1, config.categories + 1)
+        ]
+        self.budget_list = [
+            {"category_id": c["id"], "amount_in_cents": rng.randint(10_000, 200_000)}
+            for c in self.category_list[:10]
+        ]
+
+    def row(self, i: int) -> dict:
+        cents = self.cents[i]
+        return {
+            "id": i + 1,
+            "description": DESCRIPTIONS[self.descriptions[i]],
+            "date": date.fromordinal(self.days[i]).isoformat(),
+            "paid": True,
+            "amount_cents": cents,
+            "amount": cents / 100,
+            "account_id": self.accounts[i],
+            "category_id": self.categories[i],
+            "notes": None,
+        }
+
+    def slice_for(self, start: Optional[str], end: Optional[str]) -> range:
+        lo = bisect_left(self.days, date.fromisoformat(start).toordinal()) if start else 0
+        hi = bisect_right(self.days, date.fromisoformat(end).toordinal()) if end else len(self.days)
+        return range(lo, hi)
+
+def create_app(config: FakeConfig) -> Starlette:
+    """Criar app ASGI que imita os endpoints usados do Organizze"""
+    dataset = FakeDataset(config)
+    rng = random.Random(config.seed + 1)
+    stats = {"requests": 0, "errors": 0}
+
+    async def simulate_upstream():
+        stats["requests"] += 1
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": "simulated failure"}, status_code=500)
+        return None
+
+    async def accounts(request: Request):
+        return await simulate_upstream() or JSONResponse({"accounts": dataset.account_list})
+
+    async def categories(request: Request):
+        return await simulate_upstream() or JSONResponse({"categories": dataset.category_list})
+
+    async def budgets(request: Request):
+        return await simulate_upstream() or JSONResponse({"budgets": dataset.budget_list})
+
+    async def month_budgets(request: Request):
+        month = f"{request.path_params['year']}-{request.path_params['month']}-01"
+        return await simulate_upstream() or JSONResponse(
+            {"budgets": [{**b, "date": month} for b in dataset.budget_list]}
+        )
+
+    async def transactions(request: Request):
+        error = await simulate_upstream()
+        if error:
+            return error
+        params = request.query_params
+        page = max(int(params.get("page", 1)), 1)
+        per_page = max(int(params.get("per_page", 50)), 1)
+        matching = dataset.slice_for(params.get("start_date"), params.get("end_date"))
+        # Most recent first, like the real API
+        matching = matching[::-1][(page - 1) * per_page:page * per_page]
+        return JSONResponse({"transactions": [dataset.row(i) for i in matching]})
+
+    async def stats_endpoint(request: Request):
+        return JSONResponse(stats)
+
+    app = Starlette(routes=[
+        Route("/accounts", accounts),
+        Route("/categories", categories),
+        Route("/budgets", budgets),
+        Route("/budgets/{year}/{month}", month_budgets),
+        Route("/transactions", transactions),
+        Route("/__stats", stats_endpoint),
+    ])
+    app.state.dataset = dataset
+    app.state.stats = stats
+    return app
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Opções de configuração do Organizze falso (compartilhadas com o runner)"""
+    parser.add_argument("--transactions", type=int, default=FakeConfig.transactions)
+    parser.add_argument("--accounts", type=int, default=FakeConfig.accounts)
+    parser.add_argument("--categories", type=int, default=FakeConfig.categories)
+    parser.add_argument("--days", type=int, default=FakeConfig.days, help="Período coberto pelos dados")
+    parser.add_argument("--latency-ms", type=float, default=FakeConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeConfig.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=FakeConfig.error_rate)
+    parser.add_argument("--seed", type=int, default=FakeConfig.seed)
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        transactions=args.transactions,
+        accounts=args.accounts,
+        categories=args.categories,
+        days=args.days,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servidor Organizze falso para benchmarks")
+    add_arguments(parser)
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host="127.0.0.1", port=args.port, log_level="warning")
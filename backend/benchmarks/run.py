@@ -0,0 +1,236 @@
+"""Offline benchmark for the Financial Insights API.
+
+Drives the real FastAPI app in-process against the local Organizze stand-in,
+which runs in a child process so its dataset stays out of the memory figures,
+and prints a JSON report (throughput, latency percentiles, peak RSS and, with
+--trace-memory, per-scenario peak allocations) so runs can be diffed between
+commits:
+
+    cd backend
+    python -m benchmarks.run --transactions 100000 --concurrency 1,10,50 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+# Keep request logging out of the measurements
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from benchmarks.fake_organizze import FakeConfig, add_arguments, config_from_args
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "summary": "/api/analytics/summary",
+    "trends": "/api/analytics/trends?months=6",
+    "transactions": "/api/transactions?page=1&per_page=100",
+    "accounts": "/api/accounts",
+}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def start_fake(config: FakeConfig) -> Tuple[subprocess.Popen, str]:
+    """Subir o Organizze falso em outro processo e esperar ficar pronto"""
+    port = free_port()
+    argv = [sys.executable, "-m", "benchmarks.fake_organizze", "--port", str(port)]
+    for name, value in vars(config).items():
+        argv += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(argv, cwd=BACKEND_DIR)
+    url = f"http://127.0.0.1:{port}"
+
+    async with httpx.AsyncClient() as client:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Organizze falso encerrou com código {process.returncode}")
+            try:
+                await client.get(f"{url}/__stats")
+                return process, url
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def reset_caches():
+    """Limpar o cache da API e os caches em processo (árvores de categorias, índices de busca)"""
+    from app.core.cache import cache
+    from app.services import organizze_api, transaction_search
+
+    cache.clear()
+    organizze_api._category_trees.clear()
+    transaction_search._indexes.clear()
+
+async def run_scenario(client: httpx.AsyncClient, path: str, tokens: List[str],
+                       concurrency: int, total: int, cold: bool, trace_memory: bool) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for n in counter:
+            if cold:
+                # Shared by all workers: also drops entries other in-flight requests just wrote
+                reset_caches()
+            headers = {"Authorization": f"Bearer {tokens[n % len(tokens)]}"}
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "path": path,
+        "concurrency": concurrency,
+        "requests": total,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+    }
+    if trace_memory:
+        # Peak of Python allocations made during this scenario only
+        _, peak = tracemalloc.get_traced_memory()
+        result["peak_alloc_mb"] = round((peak - baseline) / (1024 * 1024), 2)
+    return result
+
+async def run(args: argparse.Namespace) -> Dict:
+    config = config_from_args(args)
+    fake, fake_url = await start_fake(config)
+    # Read by app.services.organizze_api at import time
+    os.environ["ORGANIZZE_API_URL"] = fake_url
+
+    try:
+        return await run_against(args, config, fake_url)
+    finally:
+        fake.terminate()
+        fake.wait()
+
+async def run_against(args: argparse.Namespace, config: FakeConfig, fake_url: str) -> Dict:
+    from app.core.cache import cache
+    from app.core.security import create_access_token
+    from app.main import app
+
+    # The ASGI transport does not run the app lifespan, so connect the cache here.
+    # Never the configured REDIS_URL: every scenario starts with a FLUSHDB.
+    cache.url = args.redis_url
+    cache.connect()
+    tokens = [
+        create_access_token({"sub": f"bench-user-{i}", "organizze_token": f"bench-token-{i:06d}"})
+        for i in range(args.users)
+    ]
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                reset_caches()
+                result = await run_scenario(
+                    client, SCENARIOS[name], tokens, concurrency, args.requests, args.cold,
+                    args.trace_memory
+                )
+                result["scenario"] = name
+                results.append(result)
+                print(f"{name} c={concurrency}: {result['throughput_rps']} req/s, "
+                      f"p95={result['latency_ms']['p95']}ms", file=sys.stderr)
+
+    async with httpx.AsyncClient() as client:
+        upstream = (await client.get(f"{fake_url}/__stats")).json()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "cache_backend": "redis" if cache.enabled else "memory",
+        "config": {
+            **vars(config),
+            "users": args.users,
+            "requests": args.requests,
+            "cold": args.cold,
+            "trace_memory": args.trace_memory,
+        },
+        "upstream_requests": upstream["requests"],
+        "upstream_errors": upstream["errors"],
+        "results": results,
+        # Process-wide high-water mark of the API process (the stand-in runs apart)
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline da API Financial Insights")
+    add_arguments(parser)
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=list(SCENARIOS),
+                        help=f"Lista separada por vírgula: {','.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="Requisições por cenário e nível de concorrência")
+    parser.add_argument("--users", type=int, default=10, help="Usuários distintos (chaves de cache)")
+    parser.add_argument("--cold", action="store_true",
+                        help="Limpar os caches (inclusive os em processo) antes de cada requisição; com "
+                             "concorrência > 1 a limpeza também atinge requisições em andamento")
+    parser.add_argument("--redis-url", default="",
+                        help="Redis dedicado ao benchmark (padrão: cache em memória). "
+                             "ATENÇÃO: o banco recebe FLUSHDB antes de cada cenário")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Medir o pico de alocações por cenário com tracemalloc (mais lento)")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+if __name__ == "__main__":
+    main()